@@ -8,6 +8,7 @@ import numpy as np
 from pathlib import Path
 import logging
 from typing import List, Tuple
+import json
 import re
 
 logging.basicConfig(level=logging.INFO)
@@ -21,6 +22,14 @@ except ImportError:
     HAS_SENTENCE_TRANSFORMERS = False
     logger.warning("sentence-transformers not installed. Install with: pip install sentence-transformers")
 
+# Import PyArrow (for Parquet output)
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
 
 def split_into_sentences(text: str) -> List[str]:
     """
@@ -122,10 +131,10 @@ def save_embeddings_csv(
     
     CSV format:
     - Column 1: 'text' - the text segment
-    - Column 2: 'embedding' - the embedding vector as string (list format)
+    - Column 2: 'embedding' - the embedding vector as a JSON array string
     """
-    # Convert embeddings to list format for CSV storage
-    embedding_lists = [emb.tolist() for emb in embeddings]
+    # Store embeddings as JSON arrays so loaders can parse them directly
+    embedding_lists = [json.dumps(emb.tolist()) for emb in embeddings]
     
     # Create dataframe
     df = pd.DataFrame({
@@ -139,7 +148,71 @@ def save_embeddings_csv(
     
     logger.info(f"Saved embeddings to: {output_path}")
     logger.info(f"CSV contains {len(df)} rows")
-    logger.info(f"Embedding dimension: {len(embedding_lists[0])}")
+    logger.info(f"Embedding dimension: {embeddings.shape[1]}")
+
+
+def save_embeddings_parquet(
+    text_segments: List[str],
+    embeddings: np.ndarray,
+    output_path: Path
+) -> None:
+    """
+    Save text segments and embeddings to Parquet.
+    
+    Parquet format:
+    - Column 'text': the text segment
+    - Column 'emb': the embedding as a fixed-size list of float32
+    
+    Embeddings are stored as binary floats, so loading them back is a
+    single read instead of a per-row string parse.
+    """
+    if not HAS_PYARROW:
+        raise RuntimeError(
+            "pyarrow not installed. Install with:\n"
+            "pip install pyarrow"
+        )
+    
+    arr = np.ascontiguousarray(embeddings, dtype=np.float32)
+    emb_column = pa.FixedSizeListArray.from_arrays(
+        pa.array(arr.reshape(-1), type=pa.float32()), arr.shape[1]
+    )
+    table = pa.Table.from_pydict({
+        'text': list(text_segments),
+        'emb': emb_column
+    })
+    
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    pq.write_table(table, output_path, compression="zstd")
+    
+    logger.info(f"Saved embeddings to: {output_path}")
+    logger.info(f"Parquet contains {table.num_rows} rows")
+    logger.info(f"Embedding dimension: {arr.shape[1]}")
+
+
+def save_embeddings_npy(
+    text_segments: List[str],
+    embeddings: np.ndarray,
+    output_path: Path
+) -> None:
+    """
+    Save embeddings as a float32 .npy file plus a JSON sidecar with the texts.
+    
+    Files:
+    - <name>.npy: the (N, D) float32 embedding matrix
+    - <name>.texts.json: list of the N text segments
+    
+    The .npy file can be memory-mapped by the loader, so ingesting very large
+    collections does not need the whole matrix in RAM.
+    """
+    arr = np.ascontiguousarray(embeddings, dtype=np.float32)
+    output_path = output_path.with_suffix('.npy')
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    np.save(output_path, arr)
+    with open(output_path.with_suffix('.texts.json'), 'w', encoding='utf-8') as f:
+        json.dump(list(text_segments), f, ensure_ascii=False)
+    
+    logger.info(f"Saved embeddings to: {output_path}")
+    logger.info(f"Array shape: {arr.shape}")
 
 
 def process_extracted_text(
@@ -148,21 +221,25 @@ def process_extracted_text(
     model_name: str = 'all-MiniLM-L6-v2',
     split_method: str = 'chunks',
     chunk_size: int = 400,
-    overlap: int = 50
+    overlap: int = 50,
+    output_format: str = None
 ) -> str:
     """
-    Complete pipeline: read extracted text, generate embeddings, save CSV.
+    Complete pipeline: read extracted text, generate embeddings, save to disk.
     
     Args:
         text_file_path: Path to extracted text file
-        output_csv_path: Path for output CSV (auto-generated if None)
+        output_csv_path: Path for output file (auto-generated if None)
         model_name: Sentence transformer model
         split_method: 'sentences' or 'chunks'
         chunk_size: Words per chunk (if chunks method)
         overlap: Overlapping words (if chunks method)
+        output_format: 'parquet', 'npy' (memory-mappable) or 'csv' (legacy).
+            If None, inferred from the suffix of output_csv_path, else 'parquet'.
+            An output path with a different suffix is renamed to match.
     
     Returns:
-        Path to output CSV file
+        Path to output embeddings file
     """
     text_path = Path(text_file_path)
     
@@ -186,14 +263,29 @@ def process_extracted_text(
         overlap=overlap
     )
     
-    # Determine output path
+    # Determine output format and path (loaders pick the format by suffix)
+    if output_format is None:
+        suffix = Path(output_csv_path).suffix.lower().lstrip('.') if output_csv_path else ''
+        output_format = suffix if suffix in ('parquet', 'npy', 'csv') else 'parquet'
+    if output_format not in ('parquet', 'npy', 'csv'):
+        raise ValueError(f"Unknown output_format: {output_format}")
+    
     if output_csv_path is None:
-        output_csv_path = text_path.parent.parent / "embeddings" / (text_path.stem + "_embeddings.csv")
+        output_csv_path = text_path.parent.parent / "embeddings" / (text_path.stem + f"_embeddings.{output_format}")
     
     output_csv_path = Path(output_csv_path)
+    if output_csv_path.suffix.lower() != f".{output_format}":
+        renamed = output_csv_path.with_suffix(f".{output_format}")
+        logger.warning(f"Writing {output_format} output to {renamed} instead of {output_csv_path}")
+        output_csv_path = renamed
     
-    # Save to CSV
-    save_embeddings_csv(text_segments, embeddings, output_csv_path)
+    # Save embeddings
+    if output_format == 'parquet':
+        save_embeddings_parquet(text_segments, embeddings, output_csv_path)
+    elif output_format == 'npy':
+        save_embeddings_npy(text_segments, embeddings, output_csv_path)
+    else:
+        save_embeddings_csv(text_segments, embeddings, output_csv_path)
     
     return str(output_csv_path)
 
@@ -206,7 +298,10 @@ def main():
     
     parser = argparse.ArgumentParser(description="Generate embeddings from extracted text")
     parser.add_argument('input_file', help='Path to extracted text file')
-    parser.add_argument('--output', '-o', help='Output CSV path (auto-generated if not provided)')
+    parser.add_argument('--output', '-o', help='Output file path (auto-generated if not provided)')
+    parser.add_argument('--format', choices=['parquet', 'npy', 'csv'], default=None,
+                       help='Output format (default: from --output suffix, else parquet; '
+                            'npy is memory-mappable; csv is legacy)')
     parser.add_argument('--model', default='all-MiniLM-L6-v2', 
                        help='Sentence transformer model name (default: all-MiniLM-L6-v2)')
     parser.add_argument('--split', choices=['sentences', 'chunks'], default='chunks',
@@ -225,7 +320,8 @@ def main():
             args.model,
             args.split,
             args.chunk_size,
-            args.overlap
+            args.overlap,
+            args.format
         )
         
         print("\n" + "="*70)
@@ -1,15 +1,35 @@
 from __future__ import annotations
 
+import asyncio
+import concurrent.futures
+import difflib
+import hashlib
+import json
+import logging
 import os
-from typing import Optional, Literal
+import re
+import uuid
+from typing import AsyncIterable, AsyncIterator, Dict, List, Optional, Literal, Tuple
 
-from utils import chunk_text
+from utils import BASE_DIR, ocr_noise_score, pack_chunks
+
+logger = logging.getLogger(__name__)
+
+# Transient provider errors that are worth retrying
+_RETRYABLE_ERRORS: Tuple[type, ...] = ()
 
 # Optional OpenAI import
 try:
-    from openai import OpenAI  # type: ignore
+    import openai
+    from openai import AsyncOpenAI  # type: ignore
+    _RETRYABLE_ERRORS += (
+        openai.RateLimitError,
+        openai.APIConnectionError,
+        openai.APITimeoutError,
+        openai.InternalServerError,
+    )
 except Exception:
-    OpenAI = None  # type: ignore
+    AsyncOpenAI = None  # type: ignore
 
 # Optional Gemini import
 try:
@@ -19,8 +39,48 @@ except Exception:
     genai = None
     HAS_GEMINI = False
 
+try:
+    from google.api_core import exceptions as google_exceptions
+    _RETRYABLE_ERRORS += (
+        google_exceptions.ResourceExhausted,
+        google_exceptions.ServiceUnavailable,
+        google_exceptions.DeadlineExceeded,
+    )
+except Exception:
+    pass
+
+# Optional retry with exponential backoff
+try:
+    from tenacity import (
+        AsyncRetrying,
+        retry_if_exception_type,
+        stop_after_attempt,
+        wait_exponential_jitter,
+    )
+    HAS_TENACITY = True
+except Exception:
+    HAS_TENACITY = False
+
+# Optional client-side rate limiting
+try:
+    from aiolimiter import AsyncLimiter
+    HAS_AIOLIMITER = True
+except Exception:
+    AsyncLimiter = None
+    HAS_AIOLIMITER = False
+
+# Optional on-disk completion cache
+try:
+    import diskcache
+    HAS_DISKCACHE = True
+except Exception:
+    diskcache = None
+    HAS_DISKCACHE = False
 
-# Enhanced prompts for audiobook narration
+
+# Enhanced prompts for audiobook narration.
+# Sent verbatim as the system prompt; never interpolate per-chunk data into them,
+# so every request shares an identical prefix for provider-side prompt caching.
 AUDIOBOOK_PROMPT = """You are an expert audiobook editor. Rewrite the following text to make it perfect for audiobook narration:
 
 1. Fix any OCR errors or typos
@@ -30,23 +90,221 @@ AUDIOBOOK_PROMPT = """You are an expert audiobook editor. Rewrite the following
 5. Keep the original meaning and key information intact
 6. Remove awkward phrasing that sounds unnatural when spoken
 
-Output only the improved text, no explanations."""
+Reply with ONLY the rewritten text, no headers, no lead-in."""
 
 SIMPLE_PROMPT = (
     "You are a helpful assistant. Improve clarity and fix obvious OCR errors "
-    "without changing meaning. Keep the output concise but faithful."
+    "without changing meaning. Keep the output concise but faithful. "
+    "Reply with ONLY the rewritten text, no headers, no lead-in."
 )
 
 
 LLMProvider = Literal["openai", "gemini", "auto"]
 
+GEMINI_MODEL = "gemini-1.5-flash"
+LLM_TEMPERATURE = 0.3
+LLM_CACHE_DIR = BASE_DIR / ".llm_cache"
+LLM_CACHE_TTL = 7 * 86400  # seconds
+LLM_MAX_ATTEMPTS = 5
+
+# Default requests per minute per provider
+DEFAULT_RPM_LIMITS = {"openai": 500, "gemini": 60}
+
+# Model per complexity tier, used when routing chunks by complexity; the
+# OpenAI "default" tier is replaced by the resolved model (OPENAI_MODEL)
+MODEL_TIERS = {
+    "gemini": {"fast": "gemini-1.5-flash-8b", "default": "gemini-1.5-flash", "strong": "gemini-1.5-pro"},
+    "openai": {"fast": "gpt-4o-mini", "default": "gpt-4o-mini", "strong": "gpt-4o"},
+}
+
+_cache = None
+
+
+def _get_cache():
+    """Open the on-disk completion cache lazily (None if diskcache is missing)."""
+    global _cache
+    if _cache is None and HAS_DISKCACHE:
+        _cache = diskcache.Cache(str(LLM_CACHE_DIR))
+    return _cache
+
 
-def _openai_client() -> Optional["OpenAI"]:
+# Maximum output tokens accepted per model; unknown models get the conservative default
+MAX_OUTPUT_TOKENS = {
+    "gemini-1.5-flash": 8192,
+    "gemini-1.5-flash-8b": 8192,
+    "gemini-1.5-pro": 8192,
+    "gpt-4o-mini": 16384,
+    "gpt-4o": 16384,
+    "gpt-4.1": 32768,
+    "gpt-4.1-mini": 32768,
+    "gpt-4.1-nano": 32768,
+}
+DEFAULT_MAX_OUTPUT_TOKENS = 4096
+# Rough characters per token of enriched English output, with 25% headroom
+_CHARS_PER_OUTPUT_TOKEN = 3.5 / 1.25
+
+
+def _max_output_tokens(chunk: str, model: Optional[str]) -> int:
+    """
+    Output budget for a chunk: enrichment output is roughly as long as its input,
+    capped at what the model accepts (larger values are rejected outright).
+    """
+    limit = MAX_OUTPUT_TOKENS.get(model, DEFAULT_MAX_OUTPUT_TOKENS)
+    return min(limit, max(256, int(len(chunk) / _CHARS_PER_OUTPUT_TOKEN)))
+
+
+def _max_chunk_chars(models) -> int:
+    """Largest chunk whose rewrite fits the output budget of every model in ``models``."""
+    limit = min(MAX_OUTPUT_TOKENS.get(m, DEFAULT_MAX_OUTPUT_TOKENS) for m in models)
+    return int(limit * _CHARS_PER_OUTPUT_TOKEN)
+
+
+def _hit_output_cap(response, provider: str) -> bool:
+    """True if the reply (or final stream event) was cut off at max output tokens."""
+    try:
+        if provider == "gemini":
+            reason = response.candidates[0].finish_reason
+        else:
+            reason = response.choices[0].finish_reason
+    except (AttributeError, IndexError, TypeError):
+        return False
+    return getattr(reason, "name", reason) in ("length", "MAX_TOKENS")
+
+
+def _cache_key(prompt: str, model: Optional[str], chunk: str) -> str:
+    payload = {"p": prompt, "m": model, "c": chunk, "t": LLM_TEMPERATURE}
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+SEMANTIC_CACHE_COLLECTION = "llm_enrichment_cache"
+SEMANTIC_CACHE_MODEL = "all-MiniLM-L6-v2"
+# A nearby embedding only proposes a hit; the stored original text must match this closely
+SEMANTIC_CACHE_MIN_SIMILARITY = 0.97
+
+_embedder = None
+
+
+def _get_embedder():
+    global _embedder
+    if _embedder is None:
+        from sentence_transformers import SentenceTransformer
+        _embedder = SentenceTransformer(SEMANTIC_CACHE_MODEL)
+    return _embedder
+
+
+def _semantic_cache_lookup(chunks: List[str], namespace: str, threshold: float):
+    """
+    Look up near-duplicate chunks (in practice, paragraphs) in the semantic cache.
+    
+    Only chunks that fit in the embedding model's window are considered: longer
+    ones would be truncated, so edits past the cut-off would go unnoticed. A hit
+    must also be within ``threshold`` cosine distance and its stored original
+    text must be near-identical to the chunk (SEMANTIC_CACHE_MIN_SIMILARITY).
+    
+    Returns:
+        Tuple of (collection, embeddings, hits) where embeddings maps each
+        eligible chunk index to its vector and hits maps chunk index to cached text
+    """
+    # Heavy optional dependencies, only imported when the semantic cache is enabled
+    from vectordb_save import create_vectordb
+
+    collection = create_vectordb(
+        SEMANTIC_CACHE_COLLECTION,
+        persist_directory=str(BASE_DIR / "vectordb"),
+        metadata={"hnsw:space": "cosine", "description": "LLM enrichment cache"},
+    )
+    embedder = _get_embedder()
+    eligible = [
+        i for i, ch in enumerate(chunks)
+        if ch.strip() and len(embedder.tokenizer.tokenize(ch)) <= embedder.max_seq_length - 2  # [CLS]/[SEP]
+    ]
+    embs: Dict[int, object] = {}
+    hits: Dict[int, str] = {}
+    if not eligible:
+        logger.warning(
+            f"Semantic cache: no text fits the {embedder.max_seq_length}-token window of "
+            f"{SEMANTIC_CACHE_MODEL}; nothing will be looked up or stored"
+        )
+        return collection, embs, hits
+
+    vectors = embedder.encode(
+        [chunks[i] for i in eligible], batch_size=32, convert_to_numpy=True, normalize_embeddings=True
+    )
+    embs = dict(zip(eligible, vectors))
+    if collection.count() == 0:
+        return collection, embs, hits
+
+    results = collection.query(
+        query_embeddings=vectors.tolist(),
+        n_results=1,
+        where={"namespace": namespace},
+        include=["documents", "distances", "metadatas"],
+    )
+    for i, dists, docs, metas in zip(
+        eligible, results["distances"], results["documents"], results["metadatas"]
+    ):
+        if not dists or dists[0] >= threshold:
+            continue
+        orig = (metas[0] or {}).get("orig", "")
+        if difflib.SequenceMatcher(None, orig, chunks[i]).ratio() >= SEMANTIC_CACHE_MIN_SIMILARITY:
+            hits[i] = docs[0]
+    return collection, embs, hits
+
+
+def _run_sync(coro):
+    """
+    Run a coroutine to completion from synchronous code.
+    
+    Inside an already running event loop (Jupyter, async web handlers) asyncio.run()
+    refuses to start, so the coroutine gets a fresh loop in a worker thread instead.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, coro).result()
+
+
+def _pack_around_hits(
+    paragraphs: List[str], para_hits: Dict[int, str], target_chars: int, max_chars: int
+) -> Tuple[List[str], Dict[int, str]]:
+    """
+    Pack paragraphs into chunks, keeping each cached paragraph as a chunk of its own.
+    
+    Returns:
+        Tuple of (chunks, hits) where hits maps chunk index to cached text
+    """
+    chunks: List[str] = []
+    hits: Dict[int, str] = {}
+    run: List[str] = []
+    for i, para in enumerate(paragraphs):
+        if i not in para_hits:
+            run.append(para)
+            continue
+        if run:
+            chunks.extend(pack_chunks("\n\n".join(run), target_chars=target_chars, max_chars=max_chars))
+            run = []
+        hits[len(chunks)] = para_hits[i]
+        chunks.append(para)
+    if run:
+        chunks.extend(pack_chunks("\n\n".join(run), target_chars=target_chars, max_chars=max_chars))
+    return chunks, hits
+
+
+def clear_llm_cache() -> None:
+    """Remove all cached LLM completions."""
+    cache = _get_cache()
+    if cache is not None:
+        cache.clear()
+
+
+def _openai_client() -> Optional["AsyncOpenAI"]:
     api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key or OpenAI is None:
+    if not api_key or AsyncOpenAI is None:
         return None
     try:
-        client = OpenAI(api_key=api_key)
+        client = AsyncOpenAI(api_key=api_key)
         return client
     except Exception:
         return None
@@ -61,27 +319,280 @@ def _gemini_client():
         return None
     try:
         genai.configure(api_key=api_key)
-        return genai.GenerativeModel('gemini-pro')
+        return genai.GenerativeModel(GEMINI_MODEL)
     except Exception:
         return None
 
 
+def _gemini_model(model_name: str, system_instruction: Optional[str] = None):
+    """
+    Gemini model handle per (name, system prompt); genai must already be configured.
+    
+    The prompt goes in as the system instruction, so every request shares the
+    same prefix and only the chunk text varies. Handles lazily bind an async
+    gRPC client to the running event loop, so they must not be reused across
+    asyncio.run() calls; _gemini_client() re-runs genai.configure(), which
+    drops the SDK's cached transports, before each run.
+    """
+    return genai.GenerativeModel(model_name, system_instruction=system_instruction)
+
+
+def _complexity_tier(chunk: str) -> str:
+    """Pick a model tier: short clean chunks go fast, very noisy ones go strong."""
+    noise = ocr_noise_score(chunk)
+    if len(chunk) < 1000 and noise < 0.2:
+        return "fast"
+    if noise > 0.5:
+        return "strong"
+    return "default"
+
+
+def _resolve_provider(provider: LLMProvider, model: Optional[str]) -> Optional[Tuple[str, object, Optional[str]]]:
+    """Pick the provider and build its client; None if no LLM is available."""
+    if provider == "auto":
+        if HAS_GEMINI and os.getenv("GOOGLE_API_KEY"):
+            provider = "gemini"
+        elif AsyncOpenAI and os.getenv("OPENAI_API_KEY"):
+            provider = "openai"
+        else:
+            return None
+    
+    if provider == "gemini":
+        client = _gemini_client()
+    elif provider == "openai":
+        client = _openai_client()
+        model = model or os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+    else:
+        return None
+    if client is None:
+        return None
+    return provider, client, model
+
+
+async def _with_retry(call):
+    """Await ``call()``, retrying transient provider errors with jittered backoff."""
+    if not HAS_TENACITY or not _RETRYABLE_ERRORS:
+        return await call()
+    async for attempt in AsyncRetrying(
+        stop=stop_after_attempt(LLM_MAX_ATTEMPTS),
+        wait=wait_exponential_jitter(initial=1, max=30),
+        retry=retry_if_exception_type(_RETRYABLE_ERRORS),
+        reraise=True,
+    ):
+        with attempt:
+            return await call()
+
+
+async def _openai_batch(
+    chunks: List[str],
+    prompt: str,
+    client,
+    model: str,
+    poll_interval: float = 60.0,
+) -> List[Optional[str]]:
+    """
+    Enrich chunks through OpenAI's Batch API (/v1/batches).
+    
+    Half the price of regular requests, but results can take up to 24h.
+    Returns one entry per chunk, None where the batch produced no output or
+    the reply was cut off at the output token limit.
+    """
+    lines = [
+        json.dumps({
+            "custom_id": f"chunk-{i}",
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": model,
+                "messages": [
+                    {"role": "system", "content": prompt},
+                    {"role": "user", "content": ch},
+                ],
+                "temperature": LLM_TEMPERATURE,
+                "max_tokens": _max_output_tokens(ch, model),
+            },
+        })
+        for i, ch in enumerate(chunks)
+    ]
+    batch_file = await client.files.create(
+        file=("enrich_batch.jsonl", "\n".join(lines).encode("utf-8")),
+        purpose="batch",
+    )
+    batch = await client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h",
+    )
+    logger.info(f"Submitted OpenAI batch {batch.id} with {len(chunks)} request(s)")
+    
+    while batch.status not in ("completed", "failed", "expired", "cancelled"):
+        await asyncio.sleep(poll_interval)
+        batch = await client.batches.retrieve(batch.id)
+    
+    results: List[Optional[str]] = [None] * len(chunks)
+    if batch.status != "completed" or not batch.output_file_id:
+        logger.warning(f"OpenAI batch {batch.id} ended with status: {batch.status}")
+        return results
+    
+    content = await client.files.content(batch.output_file_id)
+    for line in content.text.splitlines():
+        record = json.loads(line)
+        body = (record.get("response") or {}).get("body") or {}
+        choices = body.get("choices") or []
+        if choices and choices[0].get("finish_reason") != "length":
+            i = int(record["custom_id"].split("-", 1)[1])
+            results[i] = choices[0]["message"]["content"]
+    return results
+
+
+async def _enrich_async(
+    chunks: List[str],
+    prompt: str,
+    provider: LLMProvider,
+    client,
+    model: Optional[str] = None,
+    concurrency: int = 8,
+    use_cache: bool = True,
+    use_batch_api: bool = False,
+    rpm_limit: Optional[int] = None,
+    chunk_models: Optional[List[str]] = None,
+) -> List[str]:
+    """
+    Enrich all chunks concurrently (or via the OpenAI Batch API), preserving chunk order.
+    
+    ``chunk_models`` optionally names the model for each chunk; otherwise every
+    chunk uses the provider's default model.
+    """
+    sem = asyncio.Semaphore(max(1, concurrency))
+    rpm_limit = rpm_limit or DEFAULT_RPM_LIMITS.get(provider)
+    limiter = AsyncLimiter(rpm_limit, 60) if HAS_AIOLIMITER and rpm_limit else None
+    cache = _get_cache() if use_cache else None
+    cache_model = GEMINI_MODEL if provider == "gemini" else model
+    models = chunk_models or [cache_model] * len(chunks)
+    # One Gemini handle per model for this run (and this event loop) only
+    gemini_models: Dict[str, object] = {}
+
+    async def _call(ch: str, chunk_model: str) -> Optional[str]:
+        if limiter is not None:
+            await limiter.acquire()
+        if provider == "gemini":
+            if chunk_model not in gemini_models:
+                gemini_models[chunk_model] = _gemini_model(chunk_model, prompt)
+            response = await gemini_models[chunk_model].generate_content_async(
+                ch,
+                generation_config={
+                    "temperature": LLM_TEMPERATURE,
+                    "max_output_tokens": _max_output_tokens(ch, chunk_model),
+                },
+            )
+            if _hit_output_cap(response, provider):
+                logger.warning(f"{chunk_model} hit its output token limit; keeping the original chunk")
+                return None
+            return response.text
+        resp = await client.chat.completions.create(
+            model=chunk_model,
+            messages=[
+                {"role": "system", "content": prompt},
+                {"role": "user", "content": ch},
+            ],
+            temperature=LLM_TEMPERATURE,
+            max_tokens=_max_output_tokens(ch, chunk_model),
+        )
+        if _hit_output_cap(resp, provider):
+            logger.warning(f"{chunk_model} hit its output token limit; keeping the original chunk")
+            return None
+        return resp.choices[0].message.content
+
+    async def _one(i: int, ch: str) -> str:
+        key = _cache_key(prompt, models[i], ch) if cache is not None else None
+        if key is not None:
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+        async with sem:
+            text = await _with_retry(lambda: _call(ch, models[i]))
+        if not text:
+            return ch
+        if key is not None:
+            cache.set(key, text, expire=LLM_CACHE_TTL)
+        return text
+
+    if use_batch_api and provider == "openai":
+        outputs = [cache.get(_cache_key(prompt, cache_model, ch)) if cache is not None else None
+                   for ch in chunks]
+        missing = [i for i, out in enumerate(outputs) if out is None]
+        if missing:
+            try:
+                batch_results = await _openai_batch([chunks[i] for i in missing], prompt, client, model)
+            except Exception as e:
+                print(f"OpenAI batch error: {e}")
+                batch_results = [None] * len(missing)
+            for i, text in zip(missing, batch_results):
+                if text and cache is not None:
+                    cache.set(_cache_key(prompt, cache_model, chunks[i]), text, expire=LLM_CACHE_TTL)
+                outputs[i] = text or chunks[i]
+        return outputs
+
+    tasks = [asyncio.create_task(_one(i, ch)) for i, ch in enumerate(chunks)]
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    outputs = []
+    for ch, res in zip(chunks, results):
+        if isinstance(res, BaseException):
+            print(f"{'Gemini' if provider == 'gemini' else 'OpenAI'} error: {res}")
+            outputs.append(ch)
+        else:
+            outputs.append(res)
+    return outputs
+
+
 def enrich_text(
     text: str, 
     model: Optional[str] = None, 
-    max_chars: int = 4000,
+    max_chars: int = 32000,
     provider: LLMProvider = "auto",
     audiobook_mode: bool = True,
+    concurrency: int = 8,
+    use_cache: bool = True,
+    semantic_cache: bool = False,
+    semantic_threshold: float = 0.08,
+    target_chunk_chars: int = 24000,
+    use_batch_api: bool = False,
+    rpm_limit: Optional[int] = None,
+    gate_threshold: float = 0.0,
+    route_by_complexity: bool = False,
 ) -> str:
     """
     Enrich text using LLM (OpenAI, Gemini, or auto-detect).
     
+    Chunks are sent to the provider concurrently (bounded by ``concurrency``)
+    and reassembled in their original order.
+    
     Args:
         text: Input text to enrich
-        model: Specific model to use (e.g., "gpt-4o-mini" or "gemini-pro")
-        max_chars: Maximum characters per chunk
+        model: Specific OpenAI model to use (e.g., "gpt-4o-mini")
+        max_chars: Hard limit on characters per chunk; lowered further so each
+            chunk's rewrite fits the model's output token limit
         provider: LLM provider - "openai", "gemini", or "auto" (tries Gemini first, then OpenAI)
         audiobook_mode: Use enhanced audiobook narration prompt
+        concurrency: Maximum number of in-flight LLM requests
+        use_cache: Reuse completions cached on disk for identical (prompt, model, chunk)
+        semantic_cache: Reuse enrichments of near-duplicate paragraphs stored in
+            ChromaDB; paragraphs longer than the embedding window (about 1k chars
+            for all-MiniLM-L6-v2) are neither looked up nor stored
+        semantic_threshold: Maximum cosine distance for a semantic cache hit
+        target_chunk_chars: Paragraphs are packed into chunks up to this size,
+            so short documents go out as a single request
+        use_batch_api: Send OpenAI requests through the Batch API (50% cheaper,
+            but blocks until the batch completes, which can take hours)
+        rpm_limit: Maximum LLM requests per minute (default depends on provider);
+            transient errors such as 429s are retried with backoff
+        gate_threshold: Chunks whose ocr_noise_score is below this are kept as-is
+            without calling the LLM (e.g. 0.1); 0 sends every chunk
+        route_by_complexity: Send each chunk to a fast/default/strong model from
+            MODEL_TIERS based on its length and noise score; the default tier is the
+            provider's default model (not with use_batch_api; ignored for OpenAI
+            when ``model`` is given explicitly)
     
     Returns:
         Enriched text, or original if no LLM available
@@ -92,50 +603,243 @@ def enrich_text(
     
     prompt = AUDIOBOOK_PROMPT if audiobook_mode else SIMPLE_PROMPT
     
-    # Auto-select provider
-    if provider == "auto":
-        if HAS_GEMINI and os.getenv("GOOGLE_API_KEY"):
-            provider = "gemini"
-        elif OpenAI and os.getenv("OPENAI_API_KEY"):
-            provider = "openai"
-        else:
-            return text  # No LLM available
+    explicit_model = model is not None
+    resolved = _resolve_provider(provider, model)
+    if resolved is None:
+        return text  # No LLM available
+    provider, client, model = resolved
     
-    chunks = chunk_text(text, max_chars=max_chars)
-    outputs = []
+    # An explicitly requested OpenAI model wins over routing
+    route = route_by_complexity and not use_batch_api and not (provider == "openai" and explicit_model)
+    default_model = GEMINI_MODEL if provider == "gemini" else model
+    tier_models = {**MODEL_TIERS[provider], "default": default_model}
+    run_models = tier_models.values() if route else [default_model]
+    # Every chunk's rewrite must fit in the output budget, or it comes back cut off
+    budget_chars = _max_chunk_chars(run_models)
+    max_chars = min(max_chars, budget_chars) if max_chars > 0 else budget_chars
     
-    if provider == "gemini":
-        client = _gemini_client()
-        if client is None:
-            return text
-        
-        for ch in chunks:
+    # The semantic cache works per paragraph: packed chunks are far longer than
+    # the embedding model's window. Cached paragraphs are cut out before packing.
+    hits: Dict[int, str] = {}
+    collection = None
+    para_embs: Dict[str, object] = {}
+    namespace = _cache_key(prompt, default_model, "")
+    chunks = None
+    if semantic_cache:
+        try:
+            paragraphs = text.split("\n\n")
+            collection, embs, para_hits = _semantic_cache_lookup(paragraphs, namespace, semantic_threshold)
+            para_embs = {paragraphs[i]: vec for i, vec in embs.items()}
+            chunks, hits = _pack_around_hits(paragraphs, para_hits, target_chunk_chars, max_chars)
+        except Exception as e:
+            print(f"Semantic cache error: {e}")
+    if chunks is None:
+        chunks = pack_chunks(text, target_chars=target_chunk_chars, max_chars=max_chars)
+    logger.info(f"Enriching {len(text)} chars in {len(chunks)} chunk(s)")
+    
+    # Chunks that already look clean skip the LLM entirely
+    skipped = {
+        i: ch for i, ch in enumerate(chunks)
+        if i not in hits and ocr_noise_score(ch) < gate_threshold
+    }
+    if skipped:
+        logger.info(f"Skipped {len(skipped)}/{len(chunks)} clean chunk(s) (gate_threshold={gate_threshold})")
+    hits.update(skipped)
+    
+    pending = [i for i in range(len(chunks)) if i not in hits]
+    chunk_models = None
+    if route:
+        tiers = [_complexity_tier(chunks[i]) for i in pending]
+        chunk_models = [tier_models[tier] for tier in tiers]
+        logger.info(
+            "Model tiers: " + ", ".join(f"{t}={tiers.count(t)}" for t in ("fast", "default", "strong"))
+        )
+    
+    async def _run() -> List[str]:
+        try:
+            return await _enrich_async(
+                [chunks[i] for i in pending], prompt, provider, client,
+                model=model, concurrency=concurrency, use_cache=use_cache,
+                use_batch_api=use_batch_api, rpm_limit=rpm_limit,
+                chunk_models=chunk_models,
+            )
+        finally:
+            # The OpenAI client's connection pool belongs to this event loop
+            if provider == "openai":
+                await client.close()
+    
+    results = []
+    if pending:
+        results = _run_sync(_run())
+    outputs = [hits.get(i) for i in range(len(chunks))]
+    for i, enriched in zip(pending, results):
+        outputs[i] = enriched
+    
+    # Remember successful enrichments for future near-duplicate paragraphs
+    if collection is not None and para_embs:
+        new = []
+        for i in pending:
+            src, out = chunks[i].split("\n\n"), outputs[i].split("\n\n")
+            # Paragraphs can only be paired up if the LLM kept the paragraph structure
+            if outputs[i] != chunks[i] and len(src) == len(out):
+                new.extend((orig, enriched) for orig, enriched in zip(src, out)
+                           if orig in para_embs and enriched != orig)
+        if new:
             try:
-                response = client.generate_content(f"{prompt}\n\nText:\n{ch}")
-                outputs.append(response.text or ch)
+                collection.add(
+                    ids=[str(uuid.uuid4()) for _ in new],
+                    embeddings=[para_embs[orig].tolist() for orig, _ in new],
+                    documents=[enriched for _, enriched in new],
+                    metadatas=[{"orig": orig, "namespace": namespace} for orig, _ in new],
+                )
             except Exception as e:
-                print(f"Gemini error: {e}")
-                outputs.append(ch)
+                print(f"Semantic cache error: {e}")
     
-    elif provider == "openai":
-        client = _openai_client()
-        if client is None:
-            return text
-        
-        model = model or os.getenv("OPENAI_MODEL", "gpt-4o-mini")
-        for ch in chunks:
+    return "\n\n".join(outputs)
+
+
+async def enrich_stream(
+    text: str,
+    model: Optional[str] = None,
+    max_chars: int = 32000,
+    provider: LLMProvider = "auto",
+    audiobook_mode: bool = True,
+    use_cache: bool = True,
+    target_chunk_chars: int = 24000,
+) -> AsyncIterator[str]:
+    """
+    Enrich text and yield the output incrementally as the LLM generates it.
+    
+    Chunks are processed in order and separated by a blank line. Cached chunks
+    are yielded whole. Opening a stream is rate-limited and transient errors
+    (e.g. 429s) are retried like enrich_text; if a chunk still fails before
+    producing any output it falls back to its original text. A stream that
+    breaks or hits the output token limit after output was already yielded
+    raises RuntimeError rather than silently truncating the chunk.
+    Yields the input unchanged if no LLM is available.
+    """
+    text = text or ""
+    if not text.strip():
+        return
+    
+    prompt = AUDIOBOOK_PROMPT if audiobook_mode else SIMPLE_PROMPT
+    
+    resolved = _resolve_provider(provider, model)
+    if resolved is None:
+        yield text
+        return
+    provider, client, model = resolved
+    
+    cache = _get_cache() if use_cache else None
+    cache_model = GEMINI_MODEL if provider == "gemini" else model
+    gemini = _gemini_model(GEMINI_MODEL, prompt) if provider == "gemini" else None
+    rpm_limit = DEFAULT_RPM_LIMITS.get(provider)
+    limiter = AsyncLimiter(rpm_limit, 60) if HAS_AIOLIMITER and rpm_limit else None
+    budget_chars = _max_chunk_chars([cache_model])
+    max_chars = min(max_chars, budget_chars) if max_chars > 0 else budget_chars
+    chunks = pack_chunks(text, target_chars=target_chunk_chars, max_chars=max_chars)
+    
+    async def _deltas(stream) -> AsyncIterator[str]:
+        async for event in stream:
+            if provider == "gemini":
+                yield event.text or ""
+            else:
+                yield (event.choices[0].delta.content or "") if event.choices else ""
+            if _hit_output_cap(event, provider):
+                raise RuntimeError(f"{cache_model} hit its output token limit")
+    
+    async def _open_stream(ch: str):
+        """Start streaming a chunk; returns (first delta or None, remaining deltas)."""
+        if limiter is not None:
+            await limiter.acquire()
+        if provider == "gemini":
+            stream = await gemini.generate_content_async(
+                ch,
+                generation_config={
+                    "temperature": LLM_TEMPERATURE,
+                    "max_output_tokens": _max_output_tokens(ch, GEMINI_MODEL),
+                },
+                stream=True,
+            )
+        else:
+            stream = await client.chat.completions.create(
+                model=model,
+                messages=[
+                    {"role": "system", "content": prompt},
+                    {"role": "user", "content": ch},
+                ],
+                temperature=LLM_TEMPERATURE,
+                max_tokens=_max_output_tokens(ch, model),
+                stream=True,
+            )
+        deltas = _deltas(stream)
+        async for delta in deltas:
+            if delta:
+                return delta, deltas
+        return None, deltas
+    
+    try:
+        for n, ch in enumerate(chunks):
+            if n:
+                yield "\n\n"
+            key = _cache_key(prompt, cache_model, ch) if cache is not None else None
+            cached = cache.get(key) if key is not None else None
+            if cached is not None:
+                yield cached
+                continue
+            
             try:
-                resp = client.chat.completions.create(
-                    model=model,
-                    messages=[
-                        {"role": "system", "content": prompt},
-                        {"role": "user", "content": ch},
-                    ],
-                    temperature=0.3,
-                )
-                outputs.append(resp.choices[0].message.content or ch)
+                first, deltas = await _with_retry(lambda: _open_stream(ch))
             except Exception as e:
-                print(f"OpenAI error: {e}")
-                outputs.append(ch)
+                print(f"{'Gemini' if provider == 'gemini' else 'OpenAI'} error: {e}")
+                yield ch
+                continue
+            if first is None:
+                yield ch
+                continue
+            
+            parts = [first]
+            yield first
+            try:
+                async for delta in deltas:
+                    parts.append(delta)
+                    yield delta
+            except Exception as e:
+                raise RuntimeError(
+                    f"LLM stream failed mid-chunk ({len(''.join(parts))} chars into chunk "
+                    f"{n + 1}/{len(chunks)}); refusing to truncate the output"
+                ) from e
+            
+            if key is not None:
+                cache.set(key, "".join(parts), expire=LLM_CACHE_TTL)
+    finally:
+        # The OpenAI client's connection pool belongs to the caller's event loop
+        if provider == "openai":
+            await client.close()
+
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+async def split_sentences(deltas: AsyncIterable[str]) -> AsyncIterator[str]:
+    """Re-chunk a stream of text deltas into complete, stripped sentences."""
+    buffer = ""
+    async for delta in deltas:
+        buffer += delta
+        parts = _SENTENCE_END.split(buffer)
+        buffer = parts.pop()
+        for sentence in parts:
+            if sentence.strip():
+                yield sentence.strip()
+    if buffer.strip():
+        yield buffer.strip()
+
+
+async def enrich_sentences(text: str, **kwargs) -> AsyncIterator[str]:
+    """
+    Like enrich_stream, but yields complete sentences as soon as they are ready.
     
-    return "\n".join(outputs)
+    Keyword arguments are passed to enrich_stream.
+    """
+    async for sentence in split_sentences(enrich_stream(text, **kwargs)):
+        yield sentence
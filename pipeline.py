@@ -9,27 +9,72 @@ Processes documents through the full pipeline:
 Usage:
     python pipeline.py input.pdf --enrich --engine gtts
     python pipeline.py image.png --engine edge-tts
+    python pipeline.py book.pdf --enrich --engine edge-tts --stream
 """
 import argparse
+import asyncio
 import sys
 from pathlib import Path
+from typing import List, Tuple
 
 # Import pipeline modules
 from extractor import extract_text
-from llm_enrich import enrich_text
-from tts import tts_synthesize, list_available_engines, get_recommended_engine
+from llm_enrich import enrich_text, enrich_stream, split_sentences
+from tts import (
+    tts_synthesize,
+    tts_synthesize_stream_async,
+    list_available_engines,
+    get_recommended_engine,
+)
 from utils import write_text_file
 
 
+async def enrich_and_narrate_async(
+    text: str,
+    basename: str = "speech",
+    voice_id: str = None,
+) -> Tuple[str, Path]:
+    """
+    Enrich text with a streaming LLM and narrate it with Edge-TTS at the same time.
+    
+    Each sentence is synthesized as soon as the LLM finishes it, so audio
+    generation overlaps with LLM decoding.
+    
+    Returns:
+        Tuple of (enriched text, audio path)
+    """
+    deltas: List[str] = []
+    
+    async def _collect():
+        # Keep the raw output (paragraph breaks included) for the text file
+        async for delta in enrich_stream(text):
+            deltas.append(delta)
+            yield delta
+    
+    audio_path = await tts_synthesize_stream_async(
+        split_sentences(_collect()), voice_id=voice_id, basename=basename
+    )
+    return "".join(deltas), audio_path
+
+
+def enrich_and_narrate(text: str, basename: str = "speech", voice_id: str = None) -> Tuple[str, Path]:
+    """Synchronous wrapper around enrich_and_narrate_async."""
+    return asyncio.run(enrich_and_narrate_async(text, basename=basename, voice_id=voice_id))
+
+
 def run_pipeline(
     input_file: str,
     enrich: bool = False,
     tts_engine: str = "gtts",
     output_dir: str = "outputs",
+    stream: bool = False,
 ) -> dict:
     """
     Run complete document-to-audio pipeline.
     
+    With ``stream`` (requires enrich and the edge-tts engine), enrichment and
+    audio generation run concurrently sentence by sentence.
+    
     Returns:
         dict with paths to extracted text, enriched text (if applicable), and audio
     """
@@ -67,6 +112,55 @@ def run_pipeline(
         print(f"✗ Text extraction failed: {e}")
         return results
     
+    # Steps 2+3 pipelined: stream enriched sentences straight into TTS
+    if stream and enrich and tts_engine == "edge-tts":
+        print("\n[2-3/3] Enriching and generating audio (streaming)...")
+        try:
+            enriched_text, audio_path = enrich_and_narrate(extracted_text, basename=input_path.stem)
+            
+            enriched_filename = f"{input_path.stem}_enriched.txt"
+            enriched_path = write_text_file(enriched_text, enriched_filename)
+            results["enriched_text"] = enriched_path
+            results["audio"] = audio_path
+            
+            audio_size = audio_path.stat().st_size / 1024  # KB
+            print(f"✓ Enriched to {len(enriched_text.split())} words, audio generated ({audio_size:.1f} KB)")
+            print(f"  Saved to: {enriched_path}")
+            print(f"  Saved to: {audio_path}")
+        except Exception as e:
+            print(f"⚠ Streaming enrichment/audio failed: {e}")
+            print("  Retrying with sequential enrichment...")
+            stream = False
+            results.pop("audio", None)
+    elif stream:
+        print("\n⚠ --stream requires --enrich and --engine edge-tts; running stages sequentially")
+        stream = False
+    if not stream:
+        audio_path = _enrich_then_synthesize(extracted_text, input_path, enrich, tts_engine, results)
+        if audio_path is None:
+            return results
+    
+    # Summary
+    print("\n" + "=" * 70)
+    print("PIPELINE COMPLETE!")
+    print("=" * 70)
+    print(f"Text:  {results.get('extracted_text', 'N/A')}")
+    if "enriched_text" in results:
+        print(f"Enriched: {results['enriched_text']}")
+    print(f"Audio: {results.get('audio', 'N/A')}")
+    print("=" * 70)
+    
+    return results
+
+
+def _enrich_then_synthesize(
+    extracted_text: str,
+    input_path: Path,
+    enrich: bool,
+    tts_engine: str,
+    results: dict,
+):
+    """Steps 2 and 3 run one after the other; returns the audio path or None on failure."""
     # Step 2: Enrich text (optional)
     final_text = extracted_text
     if enrich:
@@ -115,19 +209,9 @@ def run_pipeline(
         
     except Exception as e:
         print(f"✗ Audio generation failed: {e}")
-        return results
+        return None
     
-    # Summary
-    print("\n" + "=" * 70)
-    print("PIPELINE COMPLETE!")
-    print("=" * 70)
-    print(f"Text:  {results.get('extracted_text', 'N/A')}")
-    if "enriched_text" in results:
-        print(f"Enriched: {results['enriched_text']}")
-    print(f"Audio: {results.get('audio', 'N/A')}")
-    print("=" * 70)
-    
-    return results
+    return audio_path
 
 
 def main():
@@ -174,6 +258,12 @@ Supported formats: PDF, PNG, JPG, JPEG, DOCX, TXT
         help=f"TTS engine to use (available: {', '.join(available_engine_names) if available_engine_names else 'gtts'})",
     )
     
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Stream enriched sentences straight into TTS (requires --enrich and --engine edge-tts)",
+    )
+    
     parser.add_argument(
         "--list-engines",
         action="store_true",
@@ -214,6 +304,7 @@ Supported formats: PDF, PNG, JPG, JPEG, DOCX, TXT
             input_file=args.input_file,
             enrich=args.enrich,
             tts_engine=args.engine,
+            stream=args.stream,
         )
         
         if "audio" in results:
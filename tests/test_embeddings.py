@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+import embeddings
+from embeddings import process_extracted_text
+
+
+@pytest.fixture
+def text_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        embeddings, "generate_embeddings",
+        lambda text, **kwargs: (["a segment"], np.ones((1, 4), dtype=np.float32)),
+    )
+    path = tmp_path / "text" / "book.txt"
+    path.parent.mkdir()
+    path.write_text("a segment", encoding="utf-8")
+    return path
+
+
+def test_format_defaults_to_parquet(text_file, tmp_path):
+    out = process_extracted_text(str(text_file))
+    assert out == str(tmp_path / "embeddings" / "book_embeddings.parquet")
+
+
+@pytest.mark.parametrize("suffix", ["parquet", "npy", "csv"])
+def test_format_is_inferred_from_output_suffix(text_file, tmp_path, suffix):
+    out = process_extracted_text(str(text_file), str(tmp_path / f"out.{suffix}"))
+    assert out == str(tmp_path / f"out.{suffix}")
+    assert (tmp_path / f"out.{suffix}").exists()
+
+
+def test_output_suffix_is_renamed_to_match_format(text_file, tmp_path):
+    out = process_extracted_text(str(text_file), str(tmp_path / "out.csv"), output_format="parquet")
+    assert out == str(tmp_path / "out.parquet")
+    assert not (tmp_path / "out.csv").exists()
+    assert (tmp_path / "out.parquet").read_bytes()[:4] == b"PAR1"
+
+
+def test_unknown_format_is_rejected(text_file, tmp_path):
+    with pytest.raises(ValueError):
+        process_extracted_text(str(text_file), output_format="xlsx")
@@ -0,0 +1,185 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import numpy as np
+
+import llm_enrich
+from llm_enrich import _complexity_tier, enrich_text
+
+
+class FakeOpenAI:
+    """Minimal AsyncOpenAI stand-in; ``reply(chunk, max_tokens)`` returns (text, finish_reason)."""
+
+    def __init__(self, reply):
+        self.reply = reply
+        self.calls = []
+        self.chat = SimpleNamespace(completions=self)
+
+    async def create(self, model, messages, max_tokens, **kwargs):
+        chunk = messages[1]["content"]
+        self.calls.append((model, chunk, max_tokens))
+        text, finish_reason = self.reply(chunk, max_tokens)
+        message = SimpleNamespace(content=text)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message, finish_reason=finish_reason)])
+
+    async def close(self):
+        pass
+
+
+def use_fake_openai(monkeypatch, reply):
+    client = FakeOpenAI(reply)
+    monkeypatch.setattr(
+        llm_enrich, "_resolve_provider",
+        lambda provider, model: ("openai", client, model or "gpt-4o-mini"),
+    )
+    return client
+
+
+def test_complexity_tier_routes_by_length_and_noise():
+    clean = "It is a truth universally acknowledged, and it is up to us to do so. "
+    garbled = "Th3 k1ng's c0urt wa$ f|lled w1th n0ble5 & l@dies ; tl1ey dan(ed a11 n1ght . "
+    assert _complexity_tier(clean) == "fast"
+    assert _complexity_tier(clean * 30) == "default"
+    assert _complexity_tier(garbled * 30) == "strong"
+
+
+def test_complexity_tier_does_not_misroute_clean_or_lightly_damaged_text():
+    technical = (
+        "Run `pip install -r requirements.txt`, then call f(x) = a / b + c; it returns $5 "
+        "per call, i.e. 50% of the cost (see #42 and getValue() in <config> [1] {json}). "
+    )
+    russian = "Все счастливые семьи похожи друг на друга, каждая несчастливая семья несчастлива по-своему. "
+    chinese = "我们今天去了公园，天气非常好。孩子们在草地上玩耍，老人们在树下下棋。"
+    damaged = "Tlie quick brown fox jumps over the lazy dog and then it ran horne. "
+    assert _complexity_tier(technical * 20) == "default"
+    assert _complexity_tier(russian * 20) == "default"
+    assert _complexity_tier(chinese * 40) == "default"
+    assert _complexity_tier(damaged) != "fast"
+
+
+def test_routing_uses_configured_openai_model_for_default_tier(monkeypatch):
+    client = FakeOpenAI(lambda chunk, max_tokens: (chunk.upper(), "stop"))
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    monkeypatch.setenv("OPENAI_MODEL", "gpt-4.1")
+    monkeypatch.setattr(llm_enrich, "_openai_client", lambda: client)
+    enrich_text("It was a quiet morning in the village. " * 40, provider="openai",
+                route_by_complexity=True, use_cache=False)
+    assert [model for model, _, _ in client.calls] == ["gpt-4.1"]
+
+
+def test_enrich_text_keeps_chunks_within_output_budget(monkeypatch):
+    # ~4 chars per token; anything that doesn't fit comes back cut off
+    def reply(chunk, max_tokens):
+        limit = max_tokens * 4
+        return chunk[:limit].upper(), "length" if len(chunk) > limit else "stop"
+
+    client = use_fake_openai(monkeypatch, reply)
+    text = "word " * 4800
+    out = enrich_text(text, model="unknown-model", use_cache=False)
+    assert all(max_tokens <= llm_enrich.DEFAULT_MAX_OUTPUT_TOKENS for _, _, max_tokens in client.calls)
+    assert out.replace("\n\n", "") == text.upper()
+
+
+def test_enrich_text_keeps_original_when_reply_is_cut_off(monkeypatch):
+    use_fake_openai(monkeypatch, lambda chunk, max_tokens: (chunk[:5], "length"))
+    assert enrich_text("hello there world", use_cache=False) == "hello there world"
+
+
+class FakeCollection:
+    def __init__(self):
+        self.added = []
+
+    def add(self, ids, embeddings, documents, metadatas):
+        self.added.extend((meta["orig"], doc) for doc, meta in zip(documents, metadatas))
+
+
+def test_semantic_cache_works_per_paragraph(monkeypatch):
+    collection = FakeCollection()
+
+    def lookup(paragraphs, namespace, threshold):
+        embs = {i: np.zeros(3) for i in range(len(paragraphs))}
+        return collection, embs, {1: "CACHED SECOND"}
+
+    monkeypatch.setattr(llm_enrich, "_semantic_cache_lookup", lookup)
+    client = use_fake_openai(monkeypatch, lambda chunk, max_tokens: (chunk.upper(), "stop"))
+    text = "first para\n\nsecond para\n\nthird para\n\nfourth para"
+    out = enrich_text(text, semantic_cache=True, use_cache=False)
+    assert out == "FIRST PARA\n\nCACHED SECOND\n\nTHIRD PARA\n\nFOURTH PARA"
+    assert [chunk for _, chunk, _ in client.calls] == ["first para", "third para\n\nfourth para"]
+    assert sorted(collection.added) == [
+        ("first para", "FIRST PARA"), ("fourth para", "FOURTH PARA"), ("third para", "THIRD PARA"),
+    ]
+
+
+def test_enrich_text_works_inside_running_event_loop(monkeypatch):
+    use_fake_openai(monkeypatch, lambda chunk, max_tokens: (chunk.upper(), "stop"))
+
+    async def caller():
+        return enrich_text("hello there", use_cache=False)
+
+    assert asyncio.run(caller()) == "HELLO THERE"
+
+
+class FakeCache(dict):
+    def set(self, key, value, expire=None):
+        self[key] = value
+
+
+def test_disk_cache_is_keyed_by_the_routed_model(monkeypatch):
+    cache = FakeCache()
+    monkeypatch.setattr(llm_enrich, "_get_cache", lambda: cache)
+    client = FakeOpenAI(lambda chunk, max_tokens: (chunk.upper(), "stop"))
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    monkeypatch.setenv("OPENAI_MODEL", "gpt-4.1")
+    monkeypatch.setattr(llm_enrich, "_openai_client", lambda: client)
+    text = "It was a quiet morning in the village."
+
+    assert enrich_text(text, provider="openai", route_by_complexity=True) == text.upper()
+    fast_model = llm_enrich.MODEL_TIERS["openai"]["fast"]
+    assert client.calls[0][0] == fast_model
+    assert cache == {llm_enrich._cache_key(llm_enrich.AUDIOBOOK_PROMPT, fast_model, text): text.upper()}
+
+    # Same chunk and model: served from the cache
+    enrich_text(text, provider="openai", route_by_complexity=True)
+    assert len(client.calls) == 1
+    # Different model (no routing): not a cache hit
+    enrich_text(text, provider="openai")
+    assert [model for model, _, _ in client.calls] == [fast_model, "gpt-4.1"]
+
+
+class FakeBatchClient:
+    """Stand-in for the files/batches endpoints used by _openai_batch."""
+
+    def __init__(self, output_lines):
+        self.output_lines = output_lines
+        self.files = SimpleNamespace(create=self.create_file, content=self.content)
+        self.batches = SimpleNamespace(create=self.create_batch)
+
+    async def create_file(self, file, purpose):
+        self.uploaded = [json.loads(line) for line in file[1].decode("utf-8").splitlines()]
+        return SimpleNamespace(id="file-in")
+
+    async def create_batch(self, **kwargs):
+        return SimpleNamespace(id="batch-1", status="completed", output_file_id="file-out")
+
+    async def content(self, file_id):
+        return SimpleNamespace(text="\n".join(self.output_lines))
+
+
+def batch_line(custom_id, content, finish_reason="stop"):
+    choice = {"message": {"content": content}, "finish_reason": finish_reason}
+    return json.dumps({"custom_id": custom_id, "response": {"body": {"choices": [choice]}}})
+
+
+def test_openai_batch_scatters_results_back_by_custom_id():
+    # Out of order, one cut off at the output limit, one missing entirely
+    client = FakeBatchClient([
+        batch_line("chunk-2", "THREE"),
+        batch_line("chunk-0", "ONE"),
+        batch_line("chunk-1", "TW", finish_reason="length"),
+    ])
+    chunks = ["one", "two", "three", "four"]
+    results = asyncio.run(llm_enrich._openai_batch(chunks, "prompt", client, "gpt-4o-mini"))
+    assert [line["custom_id"] for line in client.uploaded] == ["chunk-0", "chunk-1", "chunk-2", "chunk-3"]
+    assert results == ["ONE", None, "THREE", None]
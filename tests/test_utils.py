@@ -0,0 +1,80 @@
+from utils import ocr_noise_score, pack_chunks
+
+
+def test_pack_chunks_short_text_is_single_chunk():
+    assert pack_chunks("short text") == ["short text"]
+
+
+def test_pack_chunks_packs_paragraphs_up_to_target():
+    text = "\n\n".join(["a" * 100] * 10)
+    chunks = pack_chunks(text, target_chars=350, max_chars=400)
+    assert [len(c) for c in chunks] == [304, 304, 304, 100]
+    assert "\n\n".join(chunks) == text
+
+
+def test_pack_chunks_hard_splits_long_paragraph():
+    chunks = pack_chunks("x" * 1000 + "\n\nyy", target_chars=300, max_chars=400)
+    assert all(len(c) <= 400 for c in chunks)
+    assert "".join(chunks).replace("\n\n", "") == "x" * 1000 + "yy"
+
+
+def test_pack_chunks_never_exceeds_max_chars():
+    chunks = pack_chunks("a" * 3000 + "\n\n" + "b" * 3000, max_chars=4000)
+    assert chunks == ["a" * 3000, "b" * 3000]
+    assert all(len(c) <= 2 for c in pack_chunks("a b c", max_chars=2))
+
+
+AUSTEN = (
+    "It is a truth universally acknowledged, that a single man in possession of a good "
+    "fortune, must be in want of a wife. However little known the feelings or views of "
+    "such a man may be on his first entering a neighbourhood, this truth is so well fixed "
+    "in the minds of the surrounding families, that he is considered the rightful property "
+    "of some one or other of their daughters. \u201cMy dear Mr. Bennet,\u201d said his lady "
+    "to him one day, \u201chave you heard that Netherfield Park is let at last?\u201d"
+)
+
+
+def test_ocr_noise_score_clean_prose_is_near_zero():
+    assert ocr_noise_score("") == 0.0
+    assert ocr_noise_score(AUSTEN) < 0.05
+    assert ocr_noise_score(
+        "Modern governments in the northern hemisphere face a long journey, "
+        "and it is up to us to do so."
+    ) < 0.05
+    assert ocr_noise_score("In 2000, e.g. the U.S. market relied on J. K. Rowling\u2019s books.") < 0.05
+
+
+def test_ocr_noise_score_clean_technical_and_non_english_text_is_near_zero():
+    assert ocr_noise_score(
+        "Run `pip install -r requirements.txt` and set OPENAI_API_KEY in ~/.bashrc. "
+        "The function f(x) = a / b + c returns $5 per call, i.e. 50% of the cost; "
+        "see #42, user@example.com & getValue() for <details> [1] {json}."
+    ) < 0.05
+    assert ocr_noise_score(
+        "L’été dernier, nous sommes allés à Montréal ; il y a eu "
+        "beaucoup de fêtes. « Quelle journée ! » s’écria-t-elle."
+    ) < 0.05
+    assert ocr_noise_score("Все счастливые семьи похожи друг на друга.") < 0.05
+    assert ocr_noise_score("我们今天去了公园，天气非常好。") < 0.05
+
+
+def test_ocr_noise_score_flags_garbled_text():
+    assert ocr_noise_score(
+        "Tlie quick brovvn fox jurnps ovcr t he lazy d0g , and tHe rnan w1th the hat carne horne ."
+    ) > 0.3
+    assert ocr_noise_score("W h e n   t h e   w a r   e n d e d ,   t h e y   w e n t   h o m e .") > 0.3
+    assert ocr_noise_score("Th3 k1ng's c0urt wa$ f|lled w1th n0ble5 & l@dies ; tl1ey dan(ed a11 n1ght .") > 0.3
+
+
+def test_ocr_noise_score_flags_lightly_damaged_ocr():
+    # Classic letter-shape swaps only: "li" for "h", "rn" for "m", "cl" for "d"
+    assert ocr_noise_score("Tlie quick brown fox jumps over the lazy dog and then it ran horne.") > 0.3
+    assert ocr_noise_score(
+        "The governrnent of the country was, in rnany ways, a time of great change; "
+        "the people were unhappy ancl restless."
+    ) > 0.3
+
+
+def test_ocr_noise_score_grows_with_artefacts():
+    mild = AUSTEN.replace("good", "g0od").replace("minds", "rn1nds").replace("wife", "w ife")
+    assert ocr_noise_score(AUSTEN) < ocr_noise_score(mild) < 0.3
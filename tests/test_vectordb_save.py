@@ -0,0 +1,53 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from embeddings import save_embeddings_csv, save_embeddings_npy, save_embeddings_parquet
+from vectordb_save import (
+    load_embeddings_from_csv,
+    load_embeddings_from_npy,
+    load_embeddings_from_parquet,
+)
+
+TEXTS = ["First segment, with a comma.", "Second \"quoted\" segment.", "Third: ünïcode ✓"]
+EMBEDDINGS = np.random.default_rng(0).standard_normal((3, 8)).astype(np.float32)
+
+
+def assert_round_trip(texts, embeddings, metadata, source):
+    assert texts == TEXTS
+    assert embeddings.dtype == np.float32
+    np.testing.assert_array_equal(embeddings, EMBEDDINGS)
+    assert [m["index"] for m in metadata] == [0, 1, 2]
+    assert all(m["source"] == source for m in metadata)
+
+
+def test_parquet_round_trip(tmp_path):
+    path = tmp_path / "doc.parquet"
+    save_embeddings_parquet(TEXTS, EMBEDDINGS, path)
+    assert_round_trip(*load_embeddings_from_parquet(str(path)), source="doc")
+
+
+def test_npy_round_trip_is_memory_mapped(tmp_path):
+    save_embeddings_npy(TEXTS, EMBEDDINGS, tmp_path / "doc.npy")
+    assert (tmp_path / "doc.texts.json").exists()
+    texts, embeddings, metadata = load_embeddings_from_npy(str(tmp_path / "doc.npy"))
+    assert isinstance(embeddings, np.memmap)
+    assert_round_trip(texts, embeddings, metadata, source="doc")
+
+
+def test_csv_round_trip(tmp_path):
+    path = tmp_path / "doc.csv"
+    save_embeddings_csv(TEXTS, EMBEDDINGS, path)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)
+        assert_round_trip(*load_embeddings_from_csv(str(path)), source="doc")
+
+
+def test_csv_loader_reads_legacy_str_list_embeddings(tmp_path):
+    # Older versions wrote Python list reprs ("[0.1, 0.2]") rather than JSON
+    path = tmp_path / "legacy.csv"
+    pd.DataFrame({"text": TEXTS, "embedding": [emb.tolist() for emb in EMBEDDINGS]}).to_csv(path, index=False)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)
+        assert_round_trip(*load_embeddings_from_csv(str(path)), source="legacy")
@@ -2,12 +2,14 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
+import functools
 import os
 os.environ['TORCH_FORCE_WEIGHTS_ONLY_LOAD'] = '0'
         
 import logging
 from pathlib import Path
-from typing import Literal, Optional
+from typing import AsyncIterable, BinaryIO, List, Literal, Optional, Sequence
 
 from utils import ensure_dirs, timestamped_filename, OUTPUT_AUDIO_DIR
 
@@ -55,6 +57,9 @@ except ImportError:
 
 
 EngineName = Literal["pyttsx3", "gtts", "edge-tts", "coqui", "bark"]
+DeviceName = Literal["auto", "cpu", "cuda"]
+
+COQUI_MODEL = "tts_models/en/ljspeech/tacotron2-DDC"
 
 
 def validate_text(text: str) -> str:
@@ -65,6 +70,148 @@ def validate_text(text: str) -> str:
     return text
 
 
+_pyttsx3_engine = None
+_pyttsx3_defaults: dict = {}  # rate/voice of the shared engine right after init
+_BARK_LOADED = None  # (use_gpu, use_small) of the preloaded Bark models
+
+
+def _use_gpu(device: DeviceName) -> bool:
+    """Resolve ``device`` to whether neural engines should run on CUDA."""
+    if device == "cpu":
+        return False
+    try:
+        import torch
+    except ImportError:
+        available = False
+    else:
+        available = torch.cuda.is_available()
+    if device == "cuda" and not available:
+        raise RuntimeError("CUDA requested but not available")
+    return available
+
+
+def _inference_context(gpu: bool) -> contextlib.ExitStack:
+    """No-grad inference, plus FP16 autocast when running on CUDA."""
+    import torch
+
+    stack = contextlib.ExitStack()
+    stack.enter_context(torch.inference_mode())
+    if gpu:
+        stack.enter_context(torch.autocast("cuda", dtype=torch.float16))
+    return stack
+
+
+def _get_pyttsx3():
+    """Return a shared pyttsx3 engine (initializing the driver is slow)."""
+    global _pyttsx3_engine
+    if _pyttsx3_engine is None:
+        _pyttsx3_engine = pyttsx3.init()
+        _pyttsx3_defaults["rate"] = _pyttsx3_engine.getProperty("rate")
+        _pyttsx3_defaults["voice"] = _pyttsx3_engine.getProperty("voice")
+    return _pyttsx3_engine
+
+
+@functools.lru_cache(maxsize=4)
+def _get_coqui(model_name: str, gpu: bool = False):
+    """Load a Coqui model once per (model_name, gpu) and reuse it."""
+    return CoquiTTS(model_name, gpu=gpu)
+
+
+def _ensure_bark_loaded(gpu: bool = False, small_models: bool = False) -> None:
+    """Preload Bark models once per process and configuration (2-10GB)."""
+    global _BARK_LOADED
+    if _BARK_LOADED == (gpu, small_models):
+        return
+
+    import torch
+    import numpy as np
+
+    # Force disable weights_only loading for Bark compatibility
+    os.environ['TORCH_FORCE_WEIGHTS_ONLY_LOAD'] = '0'
+
+    # Add safe globals for Bark model loading (PyTorch 2.6+ compatibility)
+    torch.serialization.add_safe_globals([np.core.multiarray.scalar, np.dtype, np.dtypes.Float64DType])
+
+    logger.info("Loading Bark models (first time will download 2-10GB)...")
+    preload_models(
+        text_use_gpu=gpu, text_use_small=small_models,
+        coarse_use_gpu=gpu, coarse_use_small=small_models,
+        fine_use_gpu=gpu, fine_use_small=small_models,
+        codec_use_gpu=gpu,
+        force_reload=_BARK_LOADED is not None,
+    )
+    _BARK_LOADED = (gpu, small_models)
+
+
+def _neural_synthesize(
+    texts: Sequence[str],
+    names: Sequence[str],
+    engine: EngineName,
+    device: DeviceName = "auto",
+    bark_small_models: bool = False,
+) -> List[Path]:
+    """Synthesize texts with Coqui or Bark, loading the model once for all of them."""
+    if engine == "coqui":
+        if not HAS_COQUI:
+            raise RuntimeError(
+                "Coqui TTS not installed. Install: pip install TTS\n"
+                "Note: Models are large (~100MB+) and download on first use."
+            )
+        gpu = _use_gpu(device)
+        tts = _get_coqui(COQUI_MODEL, gpu=gpu)
+        paths = []
+        with _inference_context(gpu):
+            for text, name in zip(texts, names):
+                out_path = OUTPUT_AUDIO_DIR / (timestamped_filename(name, "coqui") + ".wav")
+                tts.tts_to_file(text=text, file_path=str(out_path))
+                logger.info(f"Synthesized with Coqui: {out_path}")
+                paths.append(out_path)
+        return paths
+
+    if engine == "bark":
+        if not HAS_BARK:
+            raise RuntimeError(
+                "Bark TTS not installed. Install: pip install git+https://github.com/suno-ai/bark.git\n"
+                "Note: Models are VERY large (2-10GB) and download on first use. Generation is slow."
+            )
+        import scipy.io.wavfile as wavfile
+
+        gpu = _use_gpu(device)
+        _ensure_bark_loaded(gpu=gpu, small_models=bark_small_models)
+        paths = []
+        with _inference_context(gpu):
+            for text, name in zip(texts, names):
+                logger.info("Generating audio with Bark (this may take several seconds)...")
+                audio_array = generate_audio(text, silent=True)
+                out_path = OUTPUT_AUDIO_DIR / (timestamped_filename(name, "bark") + ".wav")
+                wavfile.write(str(out_path), SAMPLE_RATE, audio_array)
+                logger.info(f"Synthesized with Bark: {out_path}")
+                paths.append(out_path)
+        return paths
+
+    raise ValueError(f"Unknown neural engine: {engine}")
+
+
+def _gtts_one(text: str, language: str, out_path: Path) -> None:
+    tts = gTTS(text=text, lang=language, slow=False)
+    # Stream audio chunks straight to disk as they are fetched
+    with open(out_path, "wb") as f:
+        tts.write_to_fp(f)
+
+
+async def _edge_write(text: str, voice: str, f: BinaryIO) -> None:
+    communicate = edge_tts.Communicate(text, voice)
+    # Write audio chunks as they arrive
+    async for chunk in communicate.stream():
+        if chunk["type"] == "audio":
+            f.write(chunk["data"])
+
+
+async def _edge_one(text: str, voice: str, out_path: Path) -> None:
+    with open(out_path, "wb") as f:
+        await _edge_write(text, voice, f)
+
+
 def tts_synthesize(
     text: str,
     engine: EngineName = "gtts",
@@ -72,6 +219,8 @@ def tts_synthesize(
     rate: Optional[int] = None,
     voice_id: Optional[str] = None,
     basename: str = "speech",
+    device: DeviceName = "auto",
+    bark_small_models: bool = False,
 ) -> Path:
     """Synthesize speech and return saved audio path.
 
@@ -83,6 +232,9 @@ def tts_synthesize(
     - bark: offline, ULTRA HIGH QUALITY WAV with emotions (SLOW, large models 2-10GB) 🎭
     
     Recommended: gtts (simple, reliable) or edge-tts (best quality) or bark (best audio quality)
+
+    ``device`` applies to coqui/bark: "auto" uses CUDA with FP16 autocast when
+    available. ``bark_small_models`` loads Bark's smaller checkpoints.
     """
     ensure_dirs()
     text = validate_text(text)
@@ -90,11 +242,10 @@ def tts_synthesize(
     if engine == "pyttsx3":
         if not HAS_PYTTSX3:
             raise RuntimeError("pyttsx3 not installed. Install: pip install pyttsx3")
-        eng = pyttsx3.init()
-        if rate is not None:
-            eng.setProperty("rate", rate)
-        if voice_id is not None:
-            eng.setProperty("voice", voice_id)
+        eng = _get_pyttsx3()
+        # The engine is shared, so reset anything a previous call changed
+        eng.setProperty("rate", rate if rate is not None else _pyttsx3_defaults["rate"])
+        eng.setProperty("voice", voice_id if voice_id is not None else _pyttsx3_defaults["voice"])
         out_path = OUTPUT_AUDIO_DIR / (timestamped_filename(basename, "pyttsx3") + ".wav")
         eng.save_to_file(text, str(out_path))
         eng.runAndWait()
@@ -104,9 +255,8 @@ def tts_synthesize(
     elif engine == "gtts":
         if not HAS_GTTS:
             raise RuntimeError("gTTS not installed. Install: pip install gtts")
-        tts = gTTS(text=text, lang=language, slow=False)
         out_path = OUTPUT_AUDIO_DIR / (timestamped_filename(basename, "gtts") + ".mp3")
-        tts.save(str(out_path))
+        _gtts_one(text, language, out_path)
         logger.info(f"Synthesized with gTTS: {out_path}")
         return out_path
 
@@ -119,61 +269,155 @@ def tts_synthesize(
         out_path = OUTPUT_AUDIO_DIR / (timestamped_filename(basename, "edge-tts") + ".mp3")
         
         # Edge-TTS requires async
-        async def _generate():
-            communicate = edge_tts.Communicate(text, voice)
-            await communicate.save(str(out_path))
-        
-        asyncio.run(_generate())
+        asyncio.run(_edge_one(text, voice, out_path))
         logger.info(f"Synthesized with Edge-TTS ({voice}): {out_path}")
         return out_path
 
-    elif engine == "coqui":
-        if not HAS_COQUI:
-            raise RuntimeError(
-                "Coqui TTS not installed. Install: pip install TTS\n"
-                "Note: Models are large (~100MB+) and download on first use."
-            )
-        
-        model_name = "tts_models/en/ljspeech/tacotron2-DDC"
-        tts = CoquiTTS(model_name)
-        out_path = OUTPUT_AUDIO_DIR / (timestamped_filename(basename, "coqui") + ".wav")
-        tts.tts_to_file(text=text, file_path=str(out_path))
-        logger.info(f"Synthesized with Coqui: {out_path}")
-        return out_path
-
-    elif engine == "bark":
-        if not HAS_BARK:
-            raise RuntimeError(
-                "Bark TTS not installed. Install: pip install git+https://github.com/suno-ai/bark.git\n"
-                "Note: Models are VERY large (2-10GB) and download on first use. Generation is slow."
-            )
-        
-        import scipy.io.wavfile as wavfile
-        import torch
-        import numpy as np
-        import os
-        
-        # Force disable weights_only loading for Bark compatibility
-        os.environ['TORCH_FORCE_WEIGHTS_ONLY_LOAD'] = '0'
-        
-        # Add safe globals for Bark model loading (PyTorch 2.6+ compatibility)
-        torch.serialization.add_safe_globals([np.core.multiarray.scalar, np.dtype, np.dtypes.Float64DType])
-        
-        logger.info("Loading Bark models (first time will download 2-10GB)...")
-        preload_models()
-        
-        logger.info("Generating audio with Bark (this may take several seconds)...")
-        audio_array = generate_audio(text)
-        
-        out_path = OUTPUT_AUDIO_DIR / (timestamped_filename(basename, "bark") + ".wav")
-        wavfile.write(str(out_path), SAMPLE_RATE, audio_array)
-        logger.info(f"Synthesized with Bark: {out_path}")
-        return out_path
+    elif engine in ("coqui", "bark"):
+        return _neural_synthesize(
+            [text], [basename], engine,
+            device=device, bark_small_models=bark_small_models,
+        )[0]
 
     else:
         raise ValueError(f"Unknown engine: {engine}")
 
 
+def tts_synthesize_batch(
+    texts: Sequence[str],
+    engine: EngineName = "coqui",
+    basename: str = "speech",
+    device: DeviceName = "auto",
+    bark_small_models: bool = False,
+) -> List[Path]:
+    """Synthesize several texts with a neural engine (coqui or bark).
+
+    The model is loaded once and kept on the selected device for the whole
+    batch, under a single inference/FP16 autocast context.
+    """
+    if engine not in ("coqui", "bark"):
+        raise ValueError(f"Batch synthesis supports coqui and bark, not {engine}")
+    ensure_dirs()
+    texts = [validate_text(t) for t in texts]
+    names = [f"{basename}_{i:03d}" for i in range(1, len(texts) + 1)]
+    return _neural_synthesize(
+        texts, names, engine, device=device, bark_small_models=bark_small_models
+    )
+
+
+async def tts_synthesize_many_async(
+    texts: Sequence[str],
+    engine: EngineName = "edge-tts",
+    language: str = "en",
+    rate: Optional[int] = None,
+    voice_id: Optional[str] = None,
+    basename: str = "speech",
+    concurrency: int = 6,
+    device: DeviceName = "auto",
+    bark_small_models: bool = False,
+) -> List[Path]:
+    """Synthesize several texts (e.g. chapters) and return their audio paths in order.
+
+    Online engines (edge-tts, gtts) run concurrently, bounded by ``concurrency``;
+    coqui/bark go through ``tts_synthesize_batch`` (using ``device`` and
+    ``bark_small_models``) and pyttsx3 runs sequentially.
+    """
+    ensure_dirs()
+    texts = [validate_text(t) for t in texts]
+    names = [f"{basename}_{i:03d}" for i in range(1, len(texts) + 1)]
+
+    if engine in ("coqui", "bark"):
+        return await asyncio.to_thread(
+            tts_synthesize_batch, texts, engine, basename,
+            device=device, bark_small_models=bark_small_models,
+        )
+    if engine not in ("edge-tts", "gtts"):
+        return [
+            tts_synthesize(t, engine=engine, language=language, rate=rate,
+                           voice_id=voice_id, basename=name)
+            for t, name in zip(texts, names)
+        ]
+
+    if engine == "edge-tts":
+        if not HAS_EDGE_TTS:
+            raise RuntimeError("edge-tts not installed. Install: pip install edge-tts")
+        voice = voice_id or "en-US-JennyNeural"
+    elif not HAS_GTTS:
+        raise RuntimeError("gTTS not installed. Install: pip install gtts")
+
+    paths = [OUTPUT_AUDIO_DIR / (timestamped_filename(name, engine) + ".mp3") for name in names]
+    sem = asyncio.Semaphore(max(1, concurrency))
+
+    async def bounded(text: str, out_path: Path) -> None:
+        async with sem:
+            if engine == "edge-tts":
+                await _edge_one(text, voice, out_path)
+            else:
+                # gTTS is blocking (urllib); keep it off the event loop
+                await asyncio.to_thread(_gtts_one, text, language, out_path)
+
+    await asyncio.gather(*[bounded(t, p) for t, p in zip(texts, paths)])
+    logger.info(f"Synthesized {len(paths)} files with {engine}")
+    return paths
+
+
+def tts_synthesize_many(texts: Sequence[str], **kwargs) -> List[Path]:
+    """Synchronous wrapper around :func:`tts_synthesize_many_async`."""
+    return asyncio.run(tts_synthesize_many_async(texts, **kwargs))
+
+
+async def tts_synthesize_stream_async(
+    sentences: AsyncIterable[str],
+    voice_id: Optional[str] = None,
+    basename: str = "speech",
+) -> Path:
+    """Synthesize sentences with Edge-TTS as they arrive, into a single MP3.
+
+    ``sentences`` is consumed concurrently with synthesis through a queue, so a
+    slow producer (e.g. a streaming LLM) overlaps with audio generation.
+    Edge-TTS emits MP3 frames in one fixed format, so per-sentence audio is
+    appended to the same file in order.
+    """
+    if not HAS_EDGE_TTS:
+        raise RuntimeError("edge-tts not installed. Install: pip install edge-tts")
+    ensure_dirs()
+    voice = voice_id or "en-US-JennyNeural"
+    out_path = OUTPUT_AUDIO_DIR / (timestamped_filename(basename, "edge-tts") + ".mp3")
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def produce() -> None:
+        try:
+            async for sentence in sentences:
+                if sentence.strip():
+                    await queue.put(sentence)
+        finally:
+            await queue.put(None)
+
+    producer = asyncio.create_task(produce())
+    count = 0
+    try:
+        with open(out_path, "wb") as f:
+            while (sentence := await queue.get()) is not None:
+                await _edge_write(sentence, voice, f)
+                count += 1
+        await producer  # re-raise producer errors
+        if count == 0:
+            raise ValueError("Cannot synthesize empty text")
+    except BaseException:
+        # Don't leave a truncated MP3 behind
+        out_path.unlink(missing_ok=True)
+        raise
+    finally:
+        if not producer.done():
+            producer.cancel()
+            # The synthesis error is the one worth reporting
+            with contextlib.suppress(asyncio.CancelledError, Exception):
+                await producer
+
+    logger.info(f"Synthesized {count} sentences with Edge-TTS ({voice}): {out_path}")
+    return out_path
+
+
 def list_available_engines() -> dict[str, dict]:
     """List all available TTS engines with their status."""
     return {
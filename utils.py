@@ -1,6 +1,7 @@
 import os
 import re
 import time
+import unicodedata
 from pathlib import Path
 from typing import Iterable, List, Optional
 
@@ -58,6 +59,109 @@ def chunk_text(text: str, max_chars: int = 4000, overlap: int = 200) -> List[str
     return chunks
 
 
+def pack_chunks(text: str, target_chars: int = 24000, max_chars: int = 32000) -> List[str]:
+    """Greedily pack paragraphs into as few chunks as possible.
+
+    Paragraphs (separated by blank lines) are accumulated until adding the next
+    one would exceed ``target_chars`` (clamped to ``max_chars``). A single
+    paragraph longer than ``max_chars`` is hard-split without overlap, so no
+    chunk ever exceeds ``max_chars``.
+    """
+    text = text or ""
+    if max_chars > 0:
+        target_chars = min(target_chars, max_chars)
+    if len(text) <= target_chars:
+        return [text]
+    chunks: List[str] = []
+    current: List[str] = []
+    size = 0
+    for para in text.split("\n\n"):
+        pieces = chunk_text(para, max_chars=max_chars, overlap=0) if len(para) > max_chars else [para]
+        for piece in pieces:
+            extra = len(piece) + (2 if current else 0)
+            if current and size + extra > target_chars:
+                chunks.append("\n\n".join(current))
+                current, size = [], 0
+                extra = len(piece)
+            current.append(piece)
+            size += extra
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
+
+
+# Typical OCR artefacts. Each pattern is narrow enough not to fire on clean
+# English ("modern", "it is up to us", "e.g.", "2000"), code-ish technical
+# prose ("f(x) = a / b", "getValue") or other Latin-script languages ("il y a").
+_OCR_ARTEFACTS = re.compile(
+    r"\b[a-z]{1,2}[A-Z]|[a-z][A-Z]\b"                # stray capital: "tHe", "wOrld", "ThE"
+    r"|[A-Za-z][0-9|]+[A-Za-z]"                      # digit/pipe for a letter: "t1me", "w0rld"
+    r"|(?<![\w.'’(=+*/<>-])(?<![(=+*/<>-]\s)"        # stray single letter (not a/e/i/o/y),
+    r"[b-df-hj-np-xzB-DF-HJ-NP-XZ](?![\w.'’)(])(?!\s[)=+*/<>-])"  # outside formulas: "t he"
+    r"|\s[,.](?![.\w])"                              # space before a comma/full stop: "word ,"
+    r"|\b[tTwW]li[aeiosu]"                           # "li" read for "h": "Tlie", "wliich"
+    r"|\brn[a-z]|rn[bp]"                             # "rn" read for "m": "rnan", "jurnps"
+    r"|[a-z]cl\b"                                    # "cl" read for "d": "ancl", "saicl"
+)
+# Frequent words whose OCR misreads are not caught by the patterns above
+_OCR_MISREADS = frozenset({
+    "tbe", "tbat", "bave", "horne", "sarne", "tirne", "tirnes",
+    "frorn", "thern", "hirn", "sorne", "rnore", "brovvn", "sliall", "cornrnon",
+})
+_OCR_TOKEN_RN = re.compile(r"rn[a-z]")
+# Maths/currency symbols ordinary in technical text; other non-punctuation symbols count as odd
+_ORDINARY_SYMBOLS = set("$+<=>^`")
+
+
+def _ocr_artefact_count(text: str) -> int:
+    count = len(_OCR_ARTEFACTS.findall(text))
+    for token in text.split():
+        word = token.strip(".,;:!?\"'()‘’“”")
+        if word in _OCR_MISREADS:
+            count += 1
+        # Elsewhere "rn" is only suspicious in tokens that are already odd
+        # (digits or mixed case), otherwise it flags words like "modern".
+        elif _OCR_TOKEN_RN.search(token) and (
+            any(c.isdigit() for c in token) or (token[1:] != token[1:].lower())
+        ):
+            count += 1
+    return count
+
+
+def ocr_noise_score(text: str) -> float:
+    """Cheap 0..1 estimate of how garbled (OCR-noisy) a piece of text is.
+
+    Combines the share of odd symbols (stray ``|~¦``, replacement characters,
+    box glyphs; letters in any script, punctuation and everyday technical
+    symbols don't count), extreme average word lengths in Latin text, and
+    the rate of typical OCR artefacts (stray capitals, digits inside words,
+    split words, ``rn``/``li``/``cl`` read for ``m``/``h``/``d``). Clean prose
+    scores close to 0, text with a few misreads per sentence above 0.3.
+    """
+    text = text or ""
+    words = text.split()
+    if not words:
+        return 0.0
+    n = len(text)
+    odd_ratio = sum(
+        1 for c in text
+        if not c.isalnum() and not c.isspace() and c not in _ORDINARY_SYMBOLS
+        and not unicodedata.category(c).startswith("P")
+    ) / n
+    # Scripts without spaces between words (CJK) would look like run-together words
+    latin = [w for w in words if w.isascii()]
+    len_deviation = 0.0
+    if latin:
+        len_deviation = abs(sum(len(w) for w in latin) / len(latin) - 5.0) / 5.0
+    artefact_rate = _ocr_artefact_count(text) / len(words)
+    score = (
+        3 * odd_ratio
+        + max(0.0, len_deviation - 0.5)
+        + 4 * max(0.0, artefact_rate - 0.02)
+    )
+    return min(1.0, score)
+
+
 def file_stem(path: str | Path) -> str:
     return Path(path).stem
 
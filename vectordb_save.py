@@ -6,9 +6,11 @@ Allows for efficient similarity search and retrieval
 import pandas as pd
 import numpy as np
 from pathlib import Path
+import functools
 import logging
 from typing import List, Dict, Optional
 import json
+import warnings
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -22,51 +24,169 @@ except ImportError:
     HAS_CHROMADB = False
     logger.warning("chromadb not installed. Install with: pip install chromadb")
 
+# Import orjson (fast JSON parsing for legacy CSV embeddings)
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Import PyArrow (for Parquet embeddings and fast CSV reading)
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pv
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+
+@functools.lru_cache(maxsize=8)
+def _client(path: str) -> "chromadb.ClientAPI":
+    """Open (once) the persistent ChromaDB client for a directory."""
+    return chromadb.PersistentClient(path=path)
+
+
+@functools.lru_cache(maxsize=32)
+def _collection(path: str, name: str) -> "chromadb.Collection":
+    """Get (once) an existing collection from the cached client."""
+    return _client(path).get_collection(name=name)
+
+
+def close_all_clients() -> None:
+    """Drop cached ChromaDB clients and collections (e.g. for test teardown)."""
+    _collection.cache_clear()
+    _client.cache_clear()
+
+
+def _build_metadata(texts: List[str], source: str) -> List[Dict]:
+    """Create metadata for each text segment."""
+    lengths = [len(text) for text in texts]
+    return [{'index': idx, 'source': source, 'length': length} for idx, length in enumerate(lengths)]
+
+
+def load_embeddings_from_parquet(parquet_path: str) -> tuple[List[str], np.ndarray, List[Dict]]:
+    """
+    Load embeddings from a Parquet file written by embeddings.save_embeddings_parquet.
+    
+    Args:
+        parquet_path: Path to embeddings Parquet file
+        
+    Returns:
+        Tuple of (texts, embeddings as an (N, D) float32 array, metadata)
+    """
+    if not HAS_PYARROW:
+        raise RuntimeError(
+            "pyarrow not installed. Install with:\n"
+            "pip install pyarrow"
+        )
+    
+    logger.info(f"Loading embeddings from: {parquet_path}")
+    table = pq.read_table(parquet_path)
+    
+    texts = table.column('text').to_pylist()
+    
+    # Flatten the fixed-size list column and view it as (N, D) in one pass
+    dim = table.schema.field('emb').type.list_size
+    flat = table.column('emb').combine_chunks().flatten().to_numpy(zero_copy_only=False)
+    embeddings = np.asarray(flat, dtype=np.float32).reshape(-1, dim)
+    
+    metadata = _build_metadata(texts, Path(parquet_path).stem)
+    
+    logger.info(f"Loaded {len(texts)} text segments with {dim}-dimensional embeddings")
+    return texts, embeddings, metadata
 
-def load_embeddings_from_csv(csv_path: str) -> tuple[List[str], List[List[float]], List[Dict]]:
+
+def load_embeddings_from_npy(npy_path: str) -> tuple[List[str], np.ndarray, List[Dict]]:
+    """
+    Load embeddings written by embeddings.save_embeddings_npy.
+    
+    The matrix is memory-mapped read-only, so batches are paged in from disk
+    as they are added to the collection instead of being loaded up front.
+    
+    Args:
+        npy_path: Path to the .npy embeddings file (texts are read from the
+            .texts.json sidecar next to it)
+        
+    Returns:
+        Tuple of (texts, embeddings as an (N, D) float32 memmap, metadata)
+    """
+    logger.info(f"Loading embeddings from: {npy_path}")
+    embeddings = np.load(npy_path, mmap_mode='r')
+    with open(Path(npy_path).with_suffix('.texts.json'), 'r', encoding='utf-8') as f:
+        texts = json.load(f)
+    
+    if len(texts) != embeddings.shape[0]:
+        raise ValueError(
+            f"{npy_path} has {embeddings.shape[0]} embeddings but {len(texts)} texts"
+        )
+    
+    metadata = _build_metadata(texts, Path(npy_path).stem)
+    
+    logger.info(f"Loaded {len(texts)} text segments with {embeddings.shape[1]}-dimensional embeddings")
+    return texts, embeddings, metadata
+
+
+def load_embeddings_from_csv(csv_path: str) -> tuple[List[str], np.ndarray, List[Dict]]:
     """
     Load embeddings from CSV file.
     
+    Deprecated: parsing embeddings stored as text is slow; prefer Parquet
+    files (see load_embeddings_from_parquet).
+    
     Args:
         csv_path: Path to embeddings CSV file
         
     Returns:
-        Tuple of (texts, embeddings, metadata)
+        Tuple of (texts, embeddings as an (N, D) float32 array, metadata)
     """
+    warnings.warn(
+        "Loading embeddings from CSV is deprecated; regenerate them as Parquet "
+        "with 'python embeddings.py <file> --format parquet'.",
+        DeprecationWarning,
+        stacklevel=2
+    )
     logger.info(f"Loading embeddings from: {csv_path}")
-    df = pd.read_csv(csv_path)
-    
-    texts = df['text'].tolist()
-    
-    # Convert embedding strings to lists
-    embeddings = []
-    for emb_str in df['embedding']:
-        emb_list = json.loads(emb_str.replace("'", '"'))
-        embeddings.append(emb_list)
-    
-    # Create metadata for each text segment
-    metadata = []
-    for idx, text in enumerate(texts):
-        metadata.append({
-            'index': idx,
-            'source': Path(csv_path).stem,
-            'length': len(text)
-        })
-    
-    logger.info(f"Loaded {len(texts)} text segments with {len(embeddings[0])}-dimensional embeddings")
+    if HAS_PYARROW:
+        # Multi-threaded block reader; keep the embedding column as raw strings
+        table = pv.read_csv(
+            csv_path,
+            read_options=pv.ReadOptions(use_threads=True, block_size=64 << 20),
+            convert_options=pv.ConvertOptions(
+                column_types={'text': pa.string(), 'embedding': pa.large_string()}
+            )
+        )
+        texts = table.column('text').to_pylist()
+        emb_strings = table.column('embedding').to_pylist()
+    else:
+        df = pd.read_csv(csv_path)
+        texts = df['text'].tolist()
+        emb_strings = df['embedding'].tolist()
+    
+    # Parse all embedding strings as a single JSON array, then pack into float32
+    blob = "[" + ",".join(emb_strings) + "]"
+    rows = orjson.loads(blob) if HAS_ORJSON else json.loads(blob)
+    embeddings = np.asarray(rows, dtype=np.float32)
+    
+    metadata = _build_metadata(texts, Path(csv_path).stem)
+    
+    logger.info(f"Loaded {len(texts)} text segments with {embeddings.shape[1]}-dimensional embeddings")
     return texts, embeddings, metadata
 
 
 def create_vectordb(
     collection_name: str = "audiobook_embeddings",
-    persist_directory: str = "./vectordb"
-) -> chromadb.Collection:
+    persist_directory: str = "./vectordb",
+    metadata: Optional[Dict] = None
+) -> "chromadb.Collection":
     """
     Create or get a ChromaDB collection.
     
     Args:
         collection_name: Name of the collection
         persist_directory: Directory to persist the database
+        metadata: Collection metadata used when creating it
+            (e.g. {"hnsw:space": "cosine"}); defaults to a description
         
     Returns:
         ChromaDB collection
@@ -78,16 +198,16 @@ def create_vectordb(
         )
     
     # Create persistent client
-    client = chromadb.PersistentClient(path=persist_directory)
+    client = _client(persist_directory)
     
     # Get or create collection
     try:
-        collection = client.get_collection(name=collection_name)
+        collection = _collection(persist_directory, collection_name)
         logger.info(f"Retrieved existing collection: {collection_name}")
     except:
         collection = client.create_collection(
             name=collection_name,
-            metadata={"description": "Audiobook text embeddings"}
+            metadata=metadata or {"description": "Audiobook text embeddings"}
         )
         logger.info(f"Created new collection: {collection_name}")
     
@@ -98,13 +218,13 @@ def save_to_vectordb(
     csv_path: str,
     collection_name: str = "audiobook_embeddings",
     persist_directory: str = "./vectordb",
-    batch_size: int = 100
+    batch_size: int = 1000
 ) -> str:
     """
-    Save embeddings from CSV to vector database.
+    Save embeddings from a Parquet, .npy (or legacy CSV) file to vector database.
     
     Args:
-        csv_path: Path to embeddings CSV file
+        csv_path: Path to embeddings .parquet, .npy or .csv file
         collection_name: Name of the vector DB collection
         persist_directory: Directory to persist the database
         batch_size: Number of embeddings to add per batch
@@ -113,7 +233,13 @@ def save_to_vectordb(
         Path to vector database directory
     """
     # Load embeddings
-    texts, embeddings, metadata = load_embeddings_from_csv(csv_path)
+    suffix = Path(csv_path).suffix.lower()
+    if suffix == '.parquet':
+        texts, embeddings, metadata = load_embeddings_from_parquet(csv_path)
+    elif suffix == '.npy':
+        texts, embeddings, metadata = load_embeddings_from_npy(csv_path)
+    else:
+        texts, embeddings, metadata = load_embeddings_from_csv(csv_path)
     
     # Create vector DB collection
     collection = create_vectordb(collection_name, persist_directory)
@@ -128,7 +254,7 @@ def save_to_vectordb(
         end_idx = min(i + batch_size, len(texts))
         batch_ids = ids[i:end_idx]
         batch_texts = texts[i:end_idx]
-        batch_embeddings = embeddings[i:end_idx]
+        batch_embeddings = embeddings[i:end_idx]  # zero-copy view (paged from disk for .npy)
         batch_metadata = metadata[i:end_idx]
         
         collection.add(
@@ -172,8 +298,7 @@ def query_vectordb(
         raise RuntimeError("chromadb not installed")
     
     # Connect to database
-    client = chromadb.PersistentClient(path=persist_directory)
-    collection = client.get_collection(name=collection_name)
+    collection = _collection(persist_directory, collection_name)
     
     # Query with text (ChromaDB will handle embedding if using default)
     results = collection.query(
@@ -197,8 +322,7 @@ def list_collections(persist_directory: str = "./vectordb") -> List[str]:
     if not HAS_CHROMADB:
         raise RuntimeError("chromadb not installed")
     
-    client = chromadb.PersistentClient(path=persist_directory)
-    collections = client.list_collections()
+    collections = _client(persist_directory).list_collections()
     
     return [col.name for col in collections]
 
@@ -220,8 +344,7 @@ def get_collection_stats(
     if not HAS_CHROMADB:
         raise RuntimeError("chromadb not installed")
     
-    client = chromadb.PersistentClient(path=persist_directory)
-    collection = client.get_collection(name=collection_name)
+    collection = _collection(persist_directory, collection_name)
     
     stats = {
         'name': collection.name,
@@ -239,13 +362,13 @@ def main():
     import argparse
     
     parser = argparse.ArgumentParser(description="Save embeddings to vector database")
-    parser.add_argument('csv_file', help='Path to embeddings CSV file')
+    parser.add_argument('csv_file', help='Path to embeddings Parquet, .npy or CSV file')
     parser.add_argument('--collection', default='audiobook_embeddings',
                        help='Collection name (default: audiobook_embeddings)')
     parser.add_argument('--db-dir', default='./vectordb',
                        help='Vector database directory (default: ./vectordb)')
-    parser.add_argument('--batch-size', type=int, default=100,
-                       help='Batch size for adding documents (default: 100)')
+    parser.add_argument('--batch-size', type=int, default=1000,
+                       help='Batch size for adding documents (default: 1000)')
     parser.add_argument('--query', help='Query text for similarity search (optional)')
     parser.add_argument('--top-k', type=int, default=5,
                        help='Number of results for query (default: 5)')